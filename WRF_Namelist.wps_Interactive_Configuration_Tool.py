@@ -1,9 +1,31 @@
 #!/usr/bin/env python3
 
+import collections
+import copy
+import functools
+import mmap
 import os
 import datetime
+import pickle
+import re
 import sys
-import math
+
+# Precompiled patterns for namelist parsing: one match per line instead of
+# repeated strip/startswith/split passes. Bytes patterns, since the file is
+# scanned via mmap without an upfront decode.
+_SECTION_RE = re.compile(rb"^&(\w+)")
+_PARAM_RE = re.compile(rb"^\s*([A-Za-z_]\w*)\s*=\s*(.+?),?\s*$")
+
+# Parameters that hold one value per domain (or per prefix for fg_name)
+_LIST_KEYS = frozenset({
+    "start_date", "end_date", "parent_id", "parent_grid_ratio",
+    "i_parent_start", "j_parent_start", "e_we", "e_sn", "geog_data_res",
+    "fg_name",
+})
+
+# Affirmative answers with their common capitalizations baked in, so
+# confirmation checks need neither a .lower() copy nor a list literal
+_AFFIRM = frozenset({"y", "yes", "Y", "YES", "Yes"})
 
 def main():
     print("WRF Namelist.wps Interactive Configuration Tool")
@@ -19,17 +41,24 @@ def main():
     ungrib_params = default_ungrib_params()
     metgrid_params = default_metgrid_params()
     
-    # Check if existing namelist.wps should be used for defaults
-    if os.path.exists("namelist.wps"):
+    # Check if existing namelist.wps should be used for defaults. Reading
+    # it outright and catching FileNotFoundError saves the separate
+    # existence-check stat that os.path.exists would add.
+    try:
+        existing = read_existing_namelist("namelist.wps")
+    except FileNotFoundError:
+        existing = None
+    except Exception as e:
+        print(f"Error reading existing namelist.wps: {e}")
+        print("Using built-in defaults instead.")
+        existing = None
+
+    if existing is not None:
         use_existing = get_input("An existing namelist.wps file was found. Use it for defaults? (y/n)", "y")
-        if use_existing.lower() in ['y', 'yes']:
-            try:
-                share_params, geogrid_params, ungrib_params, metgrid_params = read_existing_namelist("namelist.wps")
-                print("Successfully read existing namelist.wps for defaults.")
-            except Exception as e:
-                print(f"Error reading existing namelist.wps: {e}")
-                print("Using built-in defaults instead.")
-    
+        if use_existing in _AFFIRM:
+            share_params, geogrid_params, ungrib_params, metgrid_params = existing
+            print("Successfully read existing namelist.wps for defaults.")
+
     # Configure each section
     share_params = configure_share(share_params)
     
@@ -100,170 +129,231 @@ def default_metgrid_params():
 
 def adjust_params_for_max_dom(params, max_dom):
     """Adjust list parameters to match max_dom"""
-    list_params = [
-        "parent_id", "parent_grid_ratio", "i_parent_start", 
-        "j_parent_start", "e_we", "e_sn", "geog_data_res"
-    ]
-    
-    for key in list_params:
-        if key not in params:
-            continue
-            
-        # Extend the list if needed
-        while len(params[key]) < max_dom:
-            if key == "parent_id" and len(params[key]) > 0:
-                # For nested domains, parent is usually the domain one level up
-                params[key].append(len(params[key]))
-            elif key == "parent_grid_ratio" and len(params[key]) > 0:
-                if len(params[key]) == 1:
-                    # First nested domain often has ratio 3
-                    params[key].append(3)
-                else:
-                    # Subsequent domains often keep the same ratio
-                    params[key].append(params[key][-1])
-            elif key in ["i_parent_start", "j_parent_start"]:
-                # Default to center of parent domain for nested domains
-                if key == "i_parent_start" and len(params[key]) > 0 and len(params["e_we"]) > len(params[key]):
-                    parent_idx = params["parent_id"][len(params[key])] - 1
-                    center = params["e_we"][parent_idx] // 2
-                    child_size = params["e_we"][len(params[key])-1] // params["parent_grid_ratio"][len(params[key])-1]
-                    params[key].append(max(1, center - child_size // 2))
-                elif key == "j_parent_start" and len(params[key]) > 0 and len(params["e_sn"]) > len(params[key]):
-                    parent_idx = params["parent_id"][len(params[key])] - 1
-                    center = params["e_sn"][parent_idx] // 2
-                    child_size = params["e_sn"][len(params[key])-1] // params["parent_grid_ratio"][len(params[key])-1]
-                    params[key].append(max(1, center - child_size // 2))
-                else:
-                    params[key].append(1)
-            elif key in ["e_we", "e_sn"]:
-                # Nested domains often have similar dimensions to parent
-                if len(params[key]) > 0:
-                    # Make sure dimensions are odd for nesting
-                    last_val = params[key][-1]
-                    if last_val % 2 == 0:
-                        last_val += 1
-                    params[key].append(last_val)
-                else:
-                    params[key].append(100)  # Default
-            elif key == "geog_data_res":
-                # Use same resolution as parent by default
-                if len(params[key]) > 0:
-                    params[key].append(params[key][-1])
-                else:
-                    params[key].append("default")
-        
-        # Trim if too long
-        params[key] = params[key][:max_dom]
-    
+    # Bind the lists once and fill all of them together, one pass per new
+    # domain, instead of one while-loop per key re-indexing the dict.
+    pid = params.setdefault("parent_id", [1])
+    pgr = params.setdefault("parent_grid_ratio", [1])
+    ips = params.setdefault("i_parent_start", [1])
+    jps = params.setdefault("j_parent_start", [1])
+    ewe = params.setdefault("e_we", [100])
+    esn = params.setdefault("e_sn", [100])
+    res = params.setdefault("geog_data_res", ["default"])
+
+    for d in range(max_dom):
+        # For nested domains, parent is usually the domain one level up;
+        # the first nested domain often has ratio 3, later ones keep it
+        if d >= len(pid):
+            pid.append(d)
+        if d >= len(pgr):
+            pgr.append(3 if d == 1 else pgr[-1])
+
+        # Nested domains often have similar dimensions to parent;
+        # make sure dimensions are odd for nesting
+        if d >= len(ewe):
+            last_we = ewe[-1]
+            ewe.append(last_we + 1 if last_we % 2 == 0 else last_we)
+        if d >= len(esn):
+            last_sn = esn[-1]
+            esn.append(last_sn + 1 if last_sn % 2 == 0 else last_sn)
+
+        # Default to centering the nest in its parent domain
+        parent_idx = pid[d] - 1
+        ratio = pgr[d]
+        if d >= len(ips):
+            ips.append(max(1, ewe[parent_idx] // 2 - ewe[d] // ratio // 2))
+        if d >= len(jps):
+            jps.append(max(1, esn[parent_idx] // 2 - esn[d] // ratio // 2))
+
+        # Use same resolution as parent by default
+        if d >= len(res):
+            res.append(res[-1])
+
+    # Trim if too long, slicing the bound lists back into the dict
+    params["parent_id"] = pid[:max_dom]
+    params["parent_grid_ratio"] = pgr[:max_dom]
+    params["i_parent_start"] = ips[:max_dom]
+    params["j_parent_start"] = jps[:max_dom]
+    params["e_we"] = ewe[:max_dom]
+    params["e_sn"] = esn[:max_dom]
+    params["geog_data_res"] = res[:max_dom]
+
     return params
 
+# Parsed namelists memoized by file identity (absolute path, mtime, size),
+# persisted across runs so an unchanged file is never re-tokenized.
+_CACHE_FILE = os.path.join(os.path.expanduser("~"), ".cache", "wrf_namelist_cache.pkl")
+_parse_cache = None
+
+def _load_parse_cache():
+    """Load the persistent parse cache lazily; start empty if unreadable."""
+    global _parse_cache
+    if _parse_cache is None:
+        try:
+            with open(_CACHE_FILE, 'rb') as f:
+                _parse_cache = pickle.load(f)
+        except Exception:
+            _parse_cache = {}
+    return _parse_cache
+
+def _save_parse_cache(cache):
+    """Persist the parse cache; failures here are never fatal."""
+    try:
+        os.makedirs(os.path.dirname(_CACHE_FILE), exist_ok=True)
+        with open(_CACHE_FILE, 'wb') as f:
+            pickle.dump(cache, f)
+    except OSError:
+        pass
+
 def read_existing_namelist(filename):
-    """Read an existing namelist.wps file and extract parameters."""
-    
+    """Read an existing namelist.wps file, reusing a cached parse when the
+    file is unchanged (same path, mtime and size)."""
+    st = os.stat(filename)
+    key = (os.path.abspath(filename), st.st_mtime_ns, st.st_size)
+    cache = _load_parse_cache()
+    if key in cache:
+        return copy.deepcopy(cache[key])
+
+    result = _parse_namelist(filename)
+
+    # Drop stale entries for this path before storing the fresh parse
+    for old_key in [k for k in cache if k[0] == key[0]]:
+        del cache[old_key]
+    cache[key] = copy.deepcopy(result)
+    _save_parse_cache(cache)
+    return result
+
+def _coerce(v):
+    """Convert a raw namelist token to str, int or float.
+
+    Branches on the leading character instead of raising ValueError from
+    int()/float() attempts, so well-formed tokens never allocate an
+    exception object."""
+    c0 = v[:1]
+    if c0 in "'\"":
+        if len(v) > 1 and v.endswith(c0):
+            return v[1:-1]
+        return v
+    if c0 == '-' or c0.isdigit():
+        body = v[1:] if c0 == '-' else v
+        if body.isdigit():
+            return int(v)
+        if "." in v or "e" in v or "E" in v:
+            try:
+                return float(v)
+            except ValueError:
+                return v
+    return v
+
+def _parse_namelist(filename):
+    """Parse a namelist.wps file and extract parameters."""
+
     share_params = {}
     geogrid_params = {}
     ungrib_params = {}
     metgrid_params = {}
-    
+
+    sections = {
+        "share": share_params,
+        "geogrid": geogrid_params,
+        "ungrib": ungrib_params,
+        "metgrid": metgrid_params,
+    }
+
     current_section = None
-    
-    with open(filename, 'r') as f:
-        for line in f:
+
+    # Scan the file as memory-mapped bytes, tokenizing each line with a
+    # single regex match; only the small name/value fragments are decoded,
+    # so whole lines never pass through the text codec.
+    with open(filename, 'rb') as f:
+        try:
+            mm = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        except ValueError:
+            # Empty files cannot be mapped (and hold no parameters anyway)
+            mm = None
+
+        for line in iter(mm.readline, b"") if mm is not None else ():
             line = line.strip()
-            
+
             # Skip empty lines and comments
-            if not line or line.startswith("!"):
+            if not line or line.startswith(b"!"):
                 continue
-            
+
             # Check for section start
-            if line.startswith("&"):
-                section_name = line[1:].lower()
-                if section_name == "share":
-                    current_section = share_params
-                elif section_name == "geogrid":
-                    current_section = geogrid_params
-                elif section_name == "ungrib":
-                    current_section = ungrib_params
-                elif section_name == "metgrid":
-                    current_section = metgrid_params
+            section_match = _SECTION_RE.match(line)
+            if section_match:
+                current_section = sections.get(section_match.group(1).lower().decode("ascii"))
                 continue
-            
+
             # Check for section end
-            if line == "/" or line.startswith("/"):
+            if line.startswith(b"/"):
                 current_section = None
                 continue
-            
+
             # Parse parameter if we're in a section
-            if current_section is not None:
-                # Split at equals sign
-                parts = line.split("=", 1)
-                if len(parts) != 2:
-                    continue
-                
-                param_name = parts[0].strip()
-                param_value = parts[1].strip()
-                
-                # Remove trailing comma if present
-                if param_value.endswith(","):
-                    param_value = param_value[:-1]
-                
-                # Handle arrays (comma-separated values)
-                if "," in param_value:
-                    values = [v.strip() for v in param_value.split(",")]
-                    
-                    # Convert to appropriate type
-                    processed_values = []
-                    for v in values:
-                        # Remove quotes for strings
-                        if (v.startswith("'") and v.endswith("'")) or (v.startswith('"') and v.endswith('"')):
-                            processed_values.append(v[1:-1])
-                        # Try to convert to number if possible
-                        else:
-                            try:
-                                if "." in v:
-                                    processed_values.append(float(v))
-                                else:
-                                    processed_values.append(int(v))
-                            except ValueError:
-                                processed_values.append(v)
-                    
-                    current_section[param_name] = processed_values
-                else:
-                    # Single value
-                    if (param_value.startswith("'") and param_value.endswith("'")) or \
-                       (param_value.startswith('"') and param_value.endswith('"')):
-                        current_section[param_name] = param_value[1:-1]
-                    else:
-                        try:
-                            if "." in param_value:
-                                current_section[param_name] = float(param_value)
-                            else:
-                                current_section[param_name] = int(param_value)
-                        except ValueError:
-                            current_section[param_name] = param_value
-    
+            if current_section is None:
+                continue
+
+            param_match = _PARAM_RE.match(line)
+            if param_match is None:
+                continue
+
+            # The pattern already strips whitespace and the trailing comma
+            param_name = param_match.group(1).decode("ascii")
+            param_value = param_match.group(2)
+
+            # Handle arrays (comma-separated values), stripping, decoding
+            # and coercing each token in a single pass
+            if b"," in param_value:
+                current_section[param_name] = [
+                    _coerce(v.strip().decode("utf-8"))
+                    for v in param_value.split(b",")
+                ]
+            else:
+                # Single value
+                current_section[param_name] = _coerce(param_value.decode("utf-8"))
+
+        if mm is not None:
+            mm.close()
+
     # Convert any single-item lists to match default format
     for params in [share_params, geogrid_params, ungrib_params, metgrid_params]:
         for key, value in params.items():
-            if key in ["start_date", "end_date", "parent_id", "parent_grid_ratio", 
-                       "i_parent_start", "j_parent_start", "e_we", "e_sn", "geog_data_res",
-                       "fg_name"] and not isinstance(value, list):
+            if key in _LIST_KEYS and not isinstance(value, list):
                 params[key] = [value]
     
     return share_params, geogrid_params, ungrib_params, metgrid_params
 
+# When stdin is piped (e.g. answers file), answers are read up front and
+# prompts are not written at all - input()'s per-call stdout flush dominates
+# scripted runs otherwise.
+_INTERACTIVE = sys.stdin.isatty()
+_stdin_queue = None
+
+def _read_scripted_input():
+    """Pop the next pre-supplied answer from piped stdin."""
+    global _stdin_queue
+    if _stdin_queue is None:
+        _stdin_queue = collections.deque(sys.stdin.read().splitlines())
+    if not _stdin_queue:
+        raise EOFError("ran out of scripted input")
+    return _stdin_queue.popleft()
+
 def get_input(prompt, default=None, validator=None):
     """
     Get user input with a default value and optional validation.
     """
     while True:
-        if default is not None:
+        if not _INTERACTIVE:
+            user_input = _read_scripted_input()
+            if not user_input and default is not None:
+                return default
+        elif default is not None:
             user_input = input(f"{prompt} [{default}]: ")
             if not user_input:
                 return default
         else:
             user_input = input(f"{prompt}: ")
-        
+
         # Check for quit command
         if user_input.lower() == 'q':
             print("Configuration canceled by user.")
@@ -277,16 +367,34 @@ def get_input(prompt, default=None, validator=None):
         
         return user_input
 
+_DATE_RE = re.compile(r"^(\d{4})-(\d{2})-(\d{2})_(\d{2}):(\d{2}):(\d{2})$")
+
 def validate_date(date_str):
     """Validate that a string is in YYYY-MM-DD_HH:MM:SS format."""
-    try:
-        datetime.datetime.strptime(date_str, "%Y-%m-%d_%H:%M:%S")
-        return True, ""
-    except ValueError:
-        return False, "Date must be in format YYYY-MM-DD_HH:MM:SS"
+    error = (False, "Date must be in format YYYY-MM-DD_HH:MM:SS")
+    m = _DATE_RE.match(date_str)
+    if m is None:
+        return error
+    year, month, day, hour, minute, second = map(int, m.groups())
+    if not (year >= 1 and 1 <= month <= 12 and 1 <= day <= 31
+            and hour <= 23 and minute <= 59 and second <= 59):
+        return error
+    if day > 28:
+        # Month lengths and leap years: let datetime decide the rare cases
+        try:
+            datetime.datetime(year, month, day)
+        except ValueError:
+            return error
+    return True, ""
+
+_FLOAT_RE = re.compile(r"^[-+]?(\d+(\.\d*)?|\.\d+)([eE][-+]?\d+)?$")
 
 def validate_integer(value):
     """Validate that a string can be converted to an integer."""
+    body = value[1:] if value[:1] in "+-" else value
+    if body.isdigit():
+        return True, ""
+    # Unusual but int()-accepted spellings (surrounding whitespace, etc.)
     try:
         int(value)
         return True, ""
@@ -295,64 +403,151 @@ def validate_integer(value):
 
 def validate_positive_integer(value):
     """Validate that a string can be converted to a positive integer."""
+    if value.isdigit():
+        if int(value) > 0:
+            return True, ""
+        return False, "Value must be a positive integer"
     try:
         intval = int(value)
-        if intval <= 0:
-            return False, "Value must be a positive integer"
-        return True, ""
     except ValueError:
         return False, "Value must be an integer"
+    if intval <= 0:
+        return False, "Value must be a positive integer"
+    return True, ""
 
 def validate_float(value):
     """Validate that a string can be converted to a float."""
+    if _FLOAT_RE.match(value):
+        return True, ""
     try:
         float(value)
         return True, ""
     except ValueError:
         return False, "Value must be a number"
 
+@functools.lru_cache(maxsize=64)
+def _make_option_validator(options):
+    """Build a validator for a fixed tuple of options.
+
+    Memoized so repeated prompts share one closure with the allowed set
+    and error message precomputed instead of rebuilding both per call."""
+    allowed = frozenset(options)
+    error_message = f"Value must be one of: {', '.join(options)}"
+
+    def validator(value):
+        if value in allowed:
+            return True, ""
+        return False, error_message
+
+    return validator
+
 def validate_option(value, options):
     """Validate that a string is one of the allowed options."""
-    if value in options:
-        return True, ""
-    return False, f"Value must be one of: {', '.join(options)}"
+    return _make_option_validator(tuple(options))(value)
+
+def _ceildiv(a, b):
+    """Ceiling division on integers, without going through float."""
+    return -(-a // b)
 
 def suggest_nest_location(parent_dim, nest_dim, ratio):
     """Suggest a good starting position for a nested domain"""
     # Center the nest in the parent domain
     parent_center = parent_dim // 2
-    nest_size_in_parent = math.ceil(nest_dim / ratio)
+    nest_size_in_parent = _ceildiv(nest_dim, ratio)
     start_pos = max(1, parent_center - nest_size_in_parent // 2)
     return start_pos
 
+# Prompt schemas: (key, prompt, validator, caster) per field. Defaults come
+# from the params dict, so a single _run_prompts loop replaces the hand-rolled
+# prompt/validate/cast sequence for every scalar field. Fields with
+# per-domain loops or conditional prompts stay in their configure_* function.
+_SHARE_SCHEMA_HEAD = (
+    ("wrf_core",
+     "WRF core (ARW/NMM) - Advanced Research WRF or Non-hydrostatic Mesoscale Model",
+     _make_option_validator(("ARW", "NMM")), None),
+    ("max_dom",
+     "Maximum number of domains (1 for single domain, >1 for nested domains)",
+     validate_positive_integer, int),
+)
+
+_SHARE_SCHEMA_TAIL = (
+    ("interval_seconds",
+     "Interval between input meteorological files (seconds)",
+     validate_positive_integer, int),
+    ("io_form_geogrid",
+     "I/O format for geogrid (1=binary, 2=netCDF, 3=GRIB1)",
+     _make_option_validator(("1", "2", "3")), int),
+    ("debug_level",
+     "Debug level (0-1000, higher = more debug output)",
+     validate_integer, int),
+)
+
+_GEOGRID_SCHEMA_HEAD = (
+    ("map_proj",
+     "Map projection (lambert/mercator/polar/lat-lon)",
+     _make_option_validator(("lambert", "mercator", "polar", "lat-lon")), None),
+    ("dx",
+     "Grid spacing in x-direction for coarse domain (meters)",
+     validate_positive_integer, float),
+    ("dy",
+     "Grid spacing in y-direction for coarse domain (meters)",
+     validate_positive_integer, float),
+    ("ref_lat",
+     "Reference latitude (degrees) - center of coarse domain",
+     validate_float, float),
+    ("ref_lon",
+     "Reference longitude (degrees) - center of coarse domain",
+     validate_float, float),
+)
+
+_GEOGRID_SCHEMA_TAIL = (
+    ("stand_lon",
+     "Standard longitude (degrees) - usually same as ref_lon",
+     validate_float, float),
+)
+
+_UNGRIB_SCHEMA = (
+    ("out_format",
+     "Output format (WPS/SI/MM5/WRF)",
+     _make_option_validator(("WPS", "SI", "MM5", "WRF")), None),
+    ("prefix",
+     "Prefix for intermediate files (used as input to metgrid)",
+     None, None),
+)
+
+_METGRID_SCHEMA = (
+    ("io_form_metgrid",
+     "I/O format for metgrid (1=binary, 2=netCDF, 3=GRIB1)",
+     _make_option_validator(("1", "2", "3")), int),
+)
+
+def _run_prompts(schema, params):
+    """Prompt for each schema field, validating and casting into params."""
+    for key, prompt, validator, caster in schema:
+        default = params[key]
+        if not isinstance(default, str):
+            default = str(default)
+        answer = get_input(prompt, default, validator)
+        params[key] = caster(answer) if caster else answer
+
 def configure_share(params):
     print("\n=== Share Section Configuration ===")
     print("This section contains general settings for the WRF domain.\n")
-    
-    # WRF core
-    params["wrf_core"] = get_input(
-        "WRF core (ARW/NMM) - Advanced Research WRF or Non-hydrostatic Mesoscale Model", 
-        params["wrf_core"],
-        lambda x: validate_option(x, ["ARW", "NMM"])
-    )
-    
-    # Max domains
-    max_dom_str = get_input(
-        "Maximum number of domains (1 for single domain, >1 for nested domains)", 
-        str(params["max_dom"]),
-        validate_positive_integer
-    )
-    params["max_dom"] = int(max_dom_str)
-    
-    # Adjust lists based on max_dom
-    for key in ["start_date", "end_date"]:
-        while len(params[key]) < params["max_dom"]:
-            params[key].append(params[key][0])
-        params[key] = params[key][:params["max_dom"]]
-    
+
+    # WRF core and number of domains
+    _run_prompts(_SHARE_SCHEMA_HEAD, params)
+
+    # Adjust lists based on max_dom, binding each list and max_dom once
+    max_dom = params["max_dom"]
+    for key in ("start_date", "end_date"):
+        dates = params[key]
+        while len(dates) < max_dom:
+            dates.append(dates[0])
+        params[key] = dates[:max_dom]
+
     # Start dates for each domain
     print("\nEnter start date for each domain (YYYY-MM-DD_HH:MM:SS):")
-    for i in range(params["max_dom"]):
+    for i in range(max_dom):
         params["start_date"][i] = get_input(
             f"  Domain {i+1} start date",
             params["start_date"][i],
@@ -361,80 +556,25 @@ def configure_share(params):
     
     # End dates for each domain
     print("\nEnter end date for each domain (YYYY-MM-DD_HH:MM:SS):")
-    for i in range(params["max_dom"]):
+    for i in range(max_dom):
         params["end_date"][i] = get_input(
             f"  Domain {i+1} end date",
             params["end_date"][i],
             validate_date
         )
     
-    # Interval seconds
-    interval_str = get_input(
-        "Interval between input meteorological files (seconds)",
-        str(params["interval_seconds"]),
-        validate_positive_integer
-    )
-    params["interval_seconds"] = int(interval_str)
-    
-    # IO form geogrid
-    io_form_str = get_input(
-        "I/O format for geogrid (1=binary, 2=netCDF, 3=GRIB1)",
-        str(params["io_form_geogrid"]),
-        lambda x: validate_option(x, ["1", "2", "3"])
-    )
-    params["io_form_geogrid"] = int(io_form_str)
-    
-    # Debug level
-    debug_str = get_input(
-        "Debug level (0-1000, higher = more debug output)",
-        str(params["debug_level"]),
-        validate_integer
-    )
-    params["debug_level"] = int(debug_str)
-    
+    # Interval, I/O format and debug level
+    _run_prompts(_SHARE_SCHEMA_TAIL, params)
+
     return params
 
 def configure_geogrid(params, max_dom):
     print("\n=== Geogrid Section Configuration ===")
     print("This section defines the model domains and geographical data.\n")
     
-    # Map projection
-    params["map_proj"] = get_input(
-        "Map projection (lambert/mercator/polar/lat-lon)",
-        params["map_proj"],
-        lambda x: validate_option(x, ["lambert", "mercator", "polar", "lat-lon"])
-    )
-    
-    # Grid spacings for coarse domain
-    dx_str = get_input(
-        "Grid spacing in x-direction for coarse domain (meters)",
-        str(params["dx"]),
-        validate_positive_integer
-    )
-    params["dx"] = float(dx_str)
-    
-    dy_str = get_input(
-        "Grid spacing in y-direction for coarse domain (meters)",
-        str(params["dy"]),
-        validate_positive_integer
-    )
-    params["dy"] = float(dy_str)
-    
-    # Reference lat/lon
-    ref_lat_str = get_input(
-        "Reference latitude (degrees) - center of coarse domain",
-        str(params["ref_lat"]),
-        validate_float
-    )
-    params["ref_lat"] = float(ref_lat_str)
-    
-    ref_lon_str = get_input(
-        "Reference longitude (degrees) - center of coarse domain",
-        str(params["ref_lon"]),
-        validate_float
-    )
-    params["ref_lon"] = float(ref_lon_str)
-    
+    # Map projection, grid spacings and reference point
+    _run_prompts(_GEOGRID_SCHEMA_HEAD, params)
+
     # Parameters specific to projection type
     if params["map_proj"] == "lambert":
         print("\nLambert projection requires true latitudes:")
@@ -469,13 +609,8 @@ def configure_geogrid(params, max_dom):
         params["truelat1"] = float(truelat1_str)
     
     # Standard longitude
-    stand_lon_str = get_input(
-        "Standard longitude (degrees) - usually same as ref_lon",
-        str(params["stand_lon"]),
-        validate_float
-    )
-    params["stand_lon"] = float(stand_lon_str)
-    
+    _run_prompts(_GEOGRID_SCHEMA_TAIL, params)
+
     # Configure domain nesting if needed
     if max_dom > 1:
         print("\nSetting up domain nesting:")
@@ -488,7 +623,7 @@ def configure_geogrid(params, max_dom):
                 parent_id_str = get_input(
                     f"  Domain {i+1} parent ID (usually {i})",
                     str(params["parent_id"][i]),
-                    lambda x: validate_option(x, [str(j) for j in range(1, i+1)])
+                    _make_option_validator(tuple(str(j) for j in range(1, i+1)))
                 )
                 params["parent_id"][i] = int(parent_id_str)
         
@@ -578,8 +713,8 @@ def configure_geogrid(params, max_dom):
             params["j_parent_start"][i] = int(j_start_str)
             
             # Check if the nested domain fits within the parent
-            i_end = params["i_parent_start"][i] + math.ceil(params["e_we"][i] / params["parent_grid_ratio"][i]) - 1
-            j_end = params["j_parent_start"][i] + math.ceil(params["e_sn"][i] / params["parent_grid_ratio"][i]) - 1
+            i_end = params["i_parent_start"][i] + _ceildiv(params["e_we"][i], params["parent_grid_ratio"][i]) - 1
+            j_end = params["j_parent_start"][i] + _ceildiv(params["e_sn"][i], params["parent_grid_ratio"][i]) - 1
             
             if i_end > params["e_we"][parent_index] or j_end > params["e_sn"][parent_index]:
                 print("  WARNING: The nested domain extends beyond the parent domain boundaries.")
@@ -587,13 +722,13 @@ def configure_geogrid(params, max_dom):
                 print(f"  Parent domain has dimensions {params['e_we'][parent_index]} x {params['e_sn'][parent_index]}")
                 
                 adjust = get_input("  Adjust the nested domain to fit? (y/n)", "y")
-                if adjust.lower() in ['y', 'yes']:
+                if adjust in _AFFIRM:
                     if i_end > params["e_we"][parent_index]:
-                        new_i_start = max(1, params["e_we"][parent_index] - math.ceil(params["e_we"][i] / params["parent_grid_ratio"][i]) + 1)
+                        new_i_start = max(1, params["e_we"][parent_index] - _ceildiv(params["e_we"][i], params["parent_grid_ratio"][i]) + 1)
                         params["i_parent_start"][i] = new_i_start
                     
                     if j_end > params["e_sn"][parent_index]:
-                        new_j_start = max(1, params["e_sn"][parent_index] - math.ceil(params["e_sn"][i] / params["parent_grid_ratio"][i]) + 1)
+                        new_j_start = max(1, params["e_sn"][parent_index] - _ceildiv(params["e_sn"][i], params["parent_grid_ratio"][i]) + 1)
                         params["j_parent_start"][i] = new_j_start
                     
                     print(f"  Adjusted starting position to ({params['i_parent_start'][i]}, {params['j_parent_start'][i]})")
@@ -629,19 +764,9 @@ def configure_ungrib(params):
     print("\n=== Ungrib Section Configuration ===")
     print("This section configures how to extract meteorological data from GRIB files.\n")
     
-    # Output format
-    params["out_format"] = get_input(
-        "Output format (WPS/SI/MM5/WRF)",
-        params["out_format"],
-        lambda x: validate_option(x, ["WPS", "SI", "MM5", "WRF"])
-    )
-    
-    # Prefix
-    params["prefix"] = get_input(
-        "Prefix for intermediate files (used as input to metgrid)",
-        params["prefix"]
-    )
-    
+    # Output format and intermediate-file prefix
+    _run_prompts(_UNGRIB_SCHEMA, params)
+
     return params
 
 def configure_metgrid(params):
@@ -656,13 +781,8 @@ def configure_metgrid(params):
     params["fg_name"] = [s.strip() for s in fg_name.split(",")]
     
     # IO form metgrid
-    io_form_str = get_input(
-        "I/O format for metgrid (1=binary, 2=netCDF, 3=GRIB1)",
-        str(params["io_form_metgrid"]),
-        lambda x: validate_option(x, ["1", "2", "3"])
-    )
-    params["io_form_metgrid"] = int(io_form_str)
-    
+    _run_prompts(_METGRID_SCHEMA, params)
+
     return params
 
 def review_configuration(share, geogrid, ungrib, metgrid):
@@ -681,28 +801,30 @@ def review_configuration(share, geogrid, ungrib, metgrid):
     print(f"  Reference point: ({geogrid['ref_lat']}, {geogrid['ref_lon']})")
     print(f"  Grid spacing: {geogrid['dx']} x {geogrid['dy']} meters (domain 1)")
     
-    for i in range(share['max_dom']):
+    # Walk the parallel per-domain lists as records with a single zip
+    # rather than indexing seven dict entries per domain
+    ratios = geogrid['parent_grid_ratio']
+    domains = zip(geogrid['e_we'], geogrid['e_sn'], geogrid['parent_id'],
+                  ratios, geogrid['i_parent_start'], geogrid['j_parent_start'],
+                  geogrid['geog_data_res'])
+    for i, (e_we, e_sn, parent_id, ratio, i_start, j_start, data_res) in enumerate(domains):
         print(f"\n  Domain {i+1} configuration:")
-        print(f"    Grid dimensions: {geogrid['e_we'][i]} x {geogrid['e_sn'][i]} points")
-        
+        print(f"    Grid dimensions: {e_we} x {e_sn} points")
+
         if i > 0:
-            parent_id = geogrid['parent_id'][i]
-            ratio = geogrid['parent_grid_ratio'][i]
-            i_start = geogrid['i_parent_start'][i]
-            j_start = geogrid['j_parent_start'][i]
             print(f"    Parent: Domain {parent_id}")
             print(f"    Refinement ratio: {ratio}:1")
             print(f"    Starting position in parent: ({i_start}, {j_start})")
-            
-            # Calculate the actual resolution of this domain
+
+            # Calculate the actual resolution of this domain; dx and dy
+            # share the same divisor, so build it once
             parent_idx = parent_id - 1
-            domain_dx = geogrid['dx'] / (geogrid['parent_grid_ratio'][i] * 
-                                      (1 if parent_idx == 0 else geogrid['parent_grid_ratio'][parent_idx]))
-            domain_dy = geogrid['dy'] / (geogrid['parent_grid_ratio'][i] * 
-                                      (1 if parent_idx == 0 else geogrid['parent_grid_ratio'][parent_idx]))
+            divisor = ratio * (1 if parent_idx == 0 else ratios[parent_idx])
+            domain_dx = geogrid['dx'] / divisor
+            domain_dy = geogrid['dy'] / divisor
             print(f"    Grid spacing: {domain_dx:.1f} x {domain_dy:.1f} meters")
-        
-        print(f"    Geographic data resolution: {geogrid['geog_data_res'][i]}")
+
+        print(f"    Geographic data resolution: {data_res}")
     
     print("\nUngrib section:")
     print(f"  Output format: {ungrib['out_format']}")
@@ -714,49 +836,54 @@ def review_configuration(share, geogrid, ungrib, metgrid):
     
     # Ask for confirmation
     confirm = get_input("\nIs this configuration correct? (y/n)", "y")
-    return confirm.lower() in ['y', 'yes']
+    return confirm in _AFFIRM
+
+def _fmt_str(value):
+    return f"'{value}'"
+
+def _fmt_list(value):
+    # Namelist arrays are homogeneous, so the first element decides
+    # whether the whole list is quoted - no per-element isinstance walk
+    quote = "'" if value and isinstance(value[0], str) else ""
+    return ", ".join(f"{quote}{x}{quote}" for x in value)
+
+# Formatting dispatched on exact type; anything unlisted falls back to str()
+_FMT_DISPATCH = {list: _fmt_list, str: _fmt_str}
+
+def _format_value(value):
+    """Format a parameter value for namelist output."""
+    return _FMT_DISPATCH.get(type(value), str)(value)
+
+@functools.lru_cache(maxsize=8)
+def _namelist_template(share_keys, geogrid_keys, ungrib_keys, metgrid_keys):
+    """Build a str.format template for the given per-section key tuples.
+
+    The key names and section framing are baked in once per schema (cached
+    across writes), leaving a single C-level format pass per write."""
+    parts = []
+    index = 0
+    for section_name, keys in (("share", share_keys), ("geogrid", geogrid_keys),
+                               ("ungrib", ungrib_keys), ("metgrid", metgrid_keys)):
+        parts.append(f"&{section_name}\n")
+        for key in keys:
+            parts.append(f" {key} = {{{index}}},\n")
+            index += 1
+        parts.append("/\n\n")
+    parts[-1] = "/\n"
+    return "".join(parts)
 
 def write_namelist_wps(filename, share, geogrid, ungrib, metgrid):
     """Write the parameters to the namelist.wps file."""
-    
-    # Helper function to format arrays correctly
-    def format_value(value):
-        if isinstance(value, list):
-            # Format lists with commas
-            if all(isinstance(x, str) for x in value):
-                return ", ".join(f"'{x}'" for x in value)
-            else:
-                return ", ".join(str(x) for x in value)
-        elif isinstance(value, str):
-            return f"'{value}'"
-        else:
-            return str(value)
-    
+
+    template = _namelist_template(tuple(share), tuple(geogrid),
+                                  tuple(ungrib), tuple(metgrid))
+    values = [_format_value(v)
+              for section in (share, geogrid, ungrib, metgrid)
+              for v in section.values()]
+
     try:
-        with open(filename, 'w') as f:
-            # Write share section
-            f.write("&share\n")
-            for key, value in share.items():
-                f.write(f" {key} = {format_value(value)},\n")
-            f.write("/\n\n")
-            
-            # Write geogrid section
-            f.write("&geogrid\n")
-            for key, value in geogrid.items():
-                f.write(f" {key} = {format_value(value)},\n")
-            f.write("/\n\n")
-            
-            # Write ungrib section
-            f.write("&ungrib\n")
-            for key, value in ungrib.items():
-                f.write(f" {key} = {format_value(value)},\n")
-            f.write("/\n\n")
-            
-            # Write metgrid section
-            f.write("&metgrid\n")
-            for key, value in metgrid.items():
-                f.write(f" {key} = {format_value(value)},\n")
-            f.write("/\n")
+        with open(filename, 'w', buffering=1 << 16) as f:
+            f.write(template.format(*values))
     except Exception as e:
         print(f"Error writing to {filename}: {e}")
         sys.exit(1)